@@ -1,7 +1,46 @@
+import io
+import itertools
+import re
+import threading
+import weakref
+from contextlib import ExitStack, contextmanager
 from typing import Iterable
 
 import psycopg2
-from psycopg2 import sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+
+# заменить параметры запроса в стиле psycopg2 (%s) на нумерованные параметры PREPARE ($1, $2, ...);
+# поддерживаются только позиционные параметры %s вне строковых литералов и комментариев SQL
+def _numbered_params(sql_text):
+    param_numbers = itertools.count(1)
+    return re.sub(
+        r'%%|%s',
+        lambda m: '%' if m.group() == '%%' else f'${next(param_numbers)}',
+        sql_text
+    )
+
+
+# подготовить строки для загрузки командой COPY ... FROM STDIN (текстовый формат)
+def _copy_buffer(rows):
+    def _copy_value(value):
+        if value is None:
+            return '\\N'
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
+
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(_copy_value(value) for value in row))
+        buf.write('\n')
+    buf.seek(0)
+    return buf
 
 
 class ClientDatabase:
@@ -13,6 +52,13 @@ class ClientDatabase:
         'email': 'email',
         'телефон': 'phone'
     }
+
+    # пулы соединений, общие для всех экземпляров класса (ключ - параметры подключения к БД);
+    # пулы существуют до вызова close_pool
+    _pools = {}
+    _pools_lock = threading.Lock()
+    # подготовленные на сервере операторы SQL: соединение -> {текст запроса: имя оператора}
+    _prepared = weakref.WeakKeyDictionary()
     
     def __init__(self, database, user, password, host) -> None:
         self.db_conn_properies = {
@@ -21,16 +67,148 @@ class ClientDatabase:
             'password': password,
             'host': host
         }
-        self.conn = psycopg2.connect(**self.db_conn_properies)
-    
+        # пул соединений создаётся при первом обращении к БД
+        self._pool = None
+        # соединение открытой транзакции (берётся из пула на время транзакции)
+        self._tx_conn = None
+
+
+    # получить пул соединений для заданных параметров подключения (создать при первом обращении)
+    @classmethod
+    def _get_pool(cls, db_conn_properies):
+        key = frozenset(db_conn_properies.items())
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None or pool.closed:
+                pool = ThreadedConnectionPool(minconn=2, maxconn=20, **db_conn_properies)
+                cls._pools[key] = pool
+            return pool
+
+
+    # закрыть все соединения во всех пулах
+    @classmethod
+    def close_pool(cls):
+        with cls._pools_lock:
+            for pool in list(cls._pools.values()):
+                pool.closeall()
+            cls._pools.clear()
+
+
+    # пул соединений для параметров подключения экземпляра класса
+    @property
+    def pool(self):
+        if self._pool is None or self._pool.closed:
+            self._pool = ClientDatabase._get_pool(self.db_conn_properies)
+        return self._pool
+
+
+    # взять соединение из пула на время выполнения операции и затем вернуть его в пул
+    @contextmanager
+    def _conn(self):
+        pool = self.pool
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            pool.putconn(conn, close=conn.closed)
+
+
+    # освободить ресурсы экземпляра класса (соединения с БД экземпляр между операциями не удерживает)
+    def close(self):
+        self._pool = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    # транзакция: операции, вызванные внутри блока, выполняются на одном соединении
+    # (каждая со своим курсором) и фиксируются одним commit
+    @contextmanager
+    def transaction(self, bulk=False):
+        with self._operation(bulk=bulk) as cur:
+            yield cur
+
+
+    # операция с БД: на переданном курсоре, в уже открытой транзакции или в новой транзакции;
+    # savepoint=True - при ошибке во вложенной операции отменить только её изменения
+    @contextmanager
+    def _operation(self, cur=None, savepoint=False, bulk=False):
+        if cur is None and self._tx_conn is None:
+            with self._conn() as conn:
+                self._tx_conn = conn
+                try:
+                    with conn.cursor() as cur:
+                        if bulk:
+                            cur.execute("SET LOCAL synchronous_commit = off;")
+                        yield cur
+                    conn.commit()
+                except BaseException:
+                    if not conn.closed:
+                        conn.rollback()
+                    raise
+                finally:
+                    self._tx_conn = None
+            return
+
+        with ExitStack() as stack:
+            if cur is None:
+                cur = stack.enter_context(self._tx_conn.cursor())
+            if savepoint:
+                stack.enter_context(self._savepoint(cur))
+            if bulk:
+                cur.execute("SET LOCAL synchronous_commit = off;")
+            yield cur
+
+
+    # точка сохранения внутри открытой транзакции
+    @contextmanager
+    def _savepoint(self, cur):
+        cur.execute("SAVEPOINT nested_operation;")
+        try:
+            yield
+        except BaseException:
+            # точка сохранения освобождается и после отката, чтобы охватывающая операция
+            # ссылалась на свою точку сохранения с тем же именем
+            cur.execute("ROLLBACK TO SAVEPOINT nested_operation;")
+            cur.execute("RELEASE SAVEPOINT nested_operation;")
+            raise
+        cur.execute("RELEASE SAVEPOINT nested_operation;")
+
+
+    # выполнить запрос как подготовленный на сервере оператор: при первом выполнении запроса
+    # в соединении он подготавливается (PREPARE), далее передаётся только EXECUTE с параметрами
+    def _exec(self, cur, sql_text, params):
+        prepared = ClientDatabase._prepared.setdefault(cur.connection, {})
+        statement_name = prepared.get(sql_text)
+        if statement_name is None:
+            statement_name = f'p_{len(prepared)}'
+            cur.execute(f'PREPARE {statement_name} AS {_numbered_params(sql_text)}')
+            prepared[sql_text] = statement_name
+        if params:
+            cur.execute(f'EXECUTE {statement_name} ({", ".join(["%s"] * len(params))});', params)
+        else:
+            cur.execute(f'EXECUTE {statement_name};')
 
-    def __del__(self):
-        self.conn.close()
-    
 
     # Функция, создающая структуру БД (таблицы)
     def create_db_schema(self):
-        with self.conn.cursor() as cur:
+        with self._operation() as cur:
+            # создать функции проверки email и телефона (используются в ограничениях таблиц)
+            cur.execute(r"""
+                CREATE OR REPLACE FUNCTION is_valid_email(t text) RETURNS boolean
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE
+                AS $$ SELECT t ~ '^[\w\-\.]+\@[\w\-\.]+\.[\w]+$' $$;
+
+                CREATE OR REPLACE FUNCTION is_valid_phone(t text) RETURNS boolean
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE
+                AS $$ SELECT t ~ '^[+]{0,1}\d{0,1}[(]{0,1}\d{1,4}[)]{0,1}[-\s\./\d]*$' $$;
+            """)
+
             # создаить таблицу, содержащую сведения о клиентах
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS client (
@@ -38,7 +216,7 @@ class ClientDatabase:
                     first_name varchar(100),
                     last_name varchar(100),
                     email varchar(100),
-                    constraint email_regexp check (email ~ '^[\w\-\.]+\@[\w\-\.]+\.[\w]+$')
+                    constraint email_regexp check (is_valid_email(email))
                 );
             """)
 
@@ -46,194 +224,362 @@ class ClientDatabase:
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS client_phone (
                     client_phone_id SERIAL PRIMARY KEY,
-                    client_id integer references client(client_id),
+                    client_id integer references client(client_id) ON DELETE CASCADE,
                     phone varchar(50),
-                    constraint phone_regexp check (phone ~ '^[+]{0,1}\d{0,1}[(]{0,1}\d{1,4}[)]{0,1}[-\s\./\d]*$')
+                    constraint phone_regexp check (is_valid_phone(phone))
                 );
             """)
 
-            self.conn.commit()
+            # в ранее созданной БД пересоздать внешний ключ с каскадным удалением телефонов
+            # и ограничения, проверяющие email и телефон без функций проверки
+            cur.execute("""
+                DO $$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = 'client_phone'::regclass
+                            AND conname = 'client_phone_client_id_fkey'
+                            AND confdeltype <> 'c'
+                    ) THEN
+                        ALTER TABLE client_phone
+                            DROP CONSTRAINT client_phone_client_id_fkey,
+                            ADD CONSTRAINT client_phone_client_id_fkey
+                                FOREIGN KEY (client_id) REFERENCES client(client_id) ON DELETE CASCADE;
+                    END IF;
 
+                    IF EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = 'client'::regclass
+                            AND conname = 'email_regexp'
+                            AND pg_get_constraintdef(oid) NOT LIKE '%is_valid_email%'
+                    ) THEN
+                        ALTER TABLE client
+                            DROP CONSTRAINT email_regexp,
+                            ADD CONSTRAINT email_regexp CHECK (is_valid_email(email));
+                    END IF;
 
-    def _insert_client_phone(self, cur, client_id, phone):
-        try:
+                    IF EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = 'client_phone'::regclass
+                            AND conname = 'phone_regexp'
+                            AND pg_get_constraintdef(oid) NOT LIKE '%is_valid_phone%'
+                    ) THEN
+                        ALTER TABLE client_phone
+                            DROP CONSTRAINT phone_regexp,
+                            ADD CONSTRAINT phone_regexp CHECK (is_valid_phone(phone));
+                    END IF;
+                END
+                $$;
+            """)
+
+            # создать индексы по полям, используемым для поиска клиентов и соединения таблиц
             cur.execute("""
-                    INSERT INTO client_phone (client_id, phone)
-                    VALUES (%s, %s);
-                """,
-                (client_id, phone)
-            )
-        except psycopg2.errors.CheckViolation:
-            print('Указан некорретный номер телефона. Телефон(ы) не добавлен(ы).')
-            self.conn.rollback()
+                CREATE INDEX IF NOT EXISTS ix_client_first_name ON client (first_name);
+                CREATE INDEX IF NOT EXISTS ix_client_last_name ON client (last_name);
+                CREATE INDEX IF NOT EXISTS ix_client_phone_phone ON client_phone (phone);
+                CREATE INDEX IF NOT EXISTS ix_client_phone_client_id ON client_phone (client_id);
+            """)
+
+        # уникальный индекс по email создаётся отдельной транзакцией: в ранее созданной БД
+        # уже могут быть клиенты с одинаковым email, и это не должно отменять остальные изменения схемы
+        try:
+            with self._operation(savepoint=True) as cur:
+                cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_client_email ON client (email);")
+        except psycopg2.errors.UniqueViolation:
+            with self._operation() as cur:
+                cur.execute("""
+                    SELECT email FROM client
+                    WHERE email IS NOT NULL
+                    GROUP BY email
+                    HAVING count(*) > 1;
+                """)
+                duplicate_emails = [row[0] for row in cur.fetchall()]
+            print(f'Уникальный индекс по email не создан: email указан у нескольких клиентов ({", ".join(duplicate_emails)}).')
 
 
     # Функция, позволяющая добавить нового клиента
-    def add_client(self, first_name, last_name, email=None, phone_list=None):
-        with self.conn.cursor() as cur:
-            # вставить в БД сведения о новом клиенте
-            try:
-                cur.execute("""
-                        INSERT INTO client (first_name, last_name, email)
-                        VALUES (%s, %s, %s)
-                        RETURNING client_id;
+    def add_client(self, first_name, last_name, email=None, phone_list=None, cur=None):
+        # если также получен список телефонов клиента - вставить эти сведения в БД
+        # тем же запросом, что и сведения о клиенте
+        phones = []
+        if phone_list is not None and isinstance(phone_list, Iterable):
+            phones = list(phone_list)
+
+        try:
+            with self._operation(cur, savepoint=True) as cur:
+                # вставить в БД сведения о новом клиенте и его телефонах
+                self._exec(cur, """
+                        WITH new_client AS (
+                            INSERT INTO client (first_name, last_name, email)
+                            VALUES (%s, %s, %s)
+                            RETURNING client_id
+                        ), new_phones AS (
+                            INSERT INTO client_phone (client_id, phone)
+                            SELECT new_client.client_id, phone
+                            FROM new_client, unnest(%s::varchar[]) AS phone
+                        )
+                        SELECT client_id FROM new_client;
                     """,
-                    (first_name, last_name, email)
+                    (first_name, last_name, email, phones)
                 )
                 # получить ID вновь добавленного клиента
                 new_client_id = cur.fetchone()[0]
-                self.conn.commit()
-            except psycopg2.errors.CheckViolation:
+        except psycopg2.errors.CheckViolation as e:
+            if e.diag.constraint_name == 'phone_regexp':
+                print('Указан некорретный номер телефона. Клиент не добавлен.')
+            else:
                 print('Указан некорретный email. Клиент не добавлен.')
-                self.conn.rollback()
-                return
-            
-            # если также получен список телефонов клиента - вставить эти сведения в БД
-            if phone_list is not None and isinstance(phone_list, Iterable):
-                for phone in phone_list:
-                    self._insert_client_phone(cur, new_client_id, phone)
-                self.conn.commit()
-            
-            return new_client_id
+            return
+        except psycopg2.errors.UniqueViolation:
+            print('Клиент с указанным email уже существует. Клиент не добавлен.')
+            return
+
+        return new_client_id
+
+
+    # Функция, позволяющая добавить сразу нескольких клиентов: client_rows - кортежи (имя, фамилия, email),
+    # phones_by_idx - {индекс клиента: телефоны}; фиксация без ожидания записи WAL (при сбое загрузку повторить)
+    def add_clients(self, client_rows, phones_by_idx=None, cur=None):
+        client_rows = list(client_rows)
+        wrong_indexes = [idx for idx in (phones_by_idx or {}) if idx not in range(len(client_rows))]
+        if wrong_indexes:
+            print(f'Телефоны указаны для несуществующих клиентов (индексы: {wrong_indexes}). Клиенты не добавлены.')
+            return
+
+        try:
+            with self._operation(cur, savepoint=True, bulk=True) as cur:
+                # вставить сведения о клиентах многострочными INSERT; ID клиентов выделяются из
+                # последовательности до вставки, поэтому каждый ID возвращается вместе с индексом
+                # клиента в client_rows (порядок строк RETURNING в PostgreSQL не гарантируется)
+                client_id_by_idx = dict(execute_values(
+                    cur,
+                    """
+                        WITH new_clients AS (
+                            SELECT
+                                v.idx,
+                                nextval(pg_get_serial_sequence('client', 'client_id'))::integer AS client_id,
+                                v.first_name::varchar,
+                                v.last_name::varchar,
+                                v.email::varchar
+                            FROM (VALUES %s) AS v (idx, first_name, last_name, email)
+                        ), inserted AS (
+                            INSERT INTO client (client_id, first_name, last_name, email)
+                            SELECT client_id, first_name, last_name, email FROM new_clients
+                        )
+                        SELECT idx, client_id FROM new_clients;
+                    """,
+                    [(idx, *row) for idx, row in enumerate(client_rows)],
+                    page_size=500,
+                    fetch=True
+                ))
+                new_client_ids = [client_id_by_idx[idx] for idx in range(len(client_rows))]
+
+                # загрузить телефоны клиентов командой COPY
+                if phones_by_idx:
+                    cur.copy_expert(
+                        "COPY client_phone (client_id, phone) FROM STDIN WITH (FORMAT text);",
+                        _copy_buffer(
+                            (new_client_ids[idx], phone)
+                            for idx, phones in phones_by_idx.items()
+                            for phone in phones
+                        )
+                    )
+        except psycopg2.errors.CheckViolation as e:
+            if e.diag.constraint_name == 'phone_regexp':
+                print('Указан некорретный номер телефона. Клиенты не добавлены.')
+            else:
+                print('Указан некорретный email. Клиенты не добавлены.')
+            return
+        except psycopg2.errors.UniqueViolation:
+            print('Клиент с указанным email уже существует. Клиенты не добавлены.')
+            return
+
+        return new_client_ids
+
+
+    # вставить в БД сразу все телефоны клиента одним запросом (список телефонов передаётся массивом)
+    def _insert_client_phones(self, cur, client_id, phones):
+        self._exec(cur, """
+                INSERT INTO client_phone (client_id, phone)
+                SELECT %s::integer, phone FROM unnest(%s::varchar[]) AS phone;
+            """,
+            (client_id, list(phones))
+        )
 
 
     # Функция, позволяющая добавить телефон для существующего клиента
-    def add_client_phone(self, client_id, phone):
-        with self.conn.cursor() as cur:
-            self._insert_client_phone(cur, client_id, phone)
-        self.conn.commit()
+    def add_client_phone(self, client_id, phone, cur=None):
+        try:
+            with self._operation(cur, savepoint=True) as cur:
+                self._insert_client_phones(cur, client_id, [phone])
+        except psycopg2.errors.CheckViolation:
+            print('Указан некорретный номер телефона. Телефон не добавлен.')
     
 
     # Функция, позволяющая изменить данные о клиенте
-    def update_client(self, client_id, new_first_name, new_last_name, new_email):
-        with self.conn.cursor() as cur:
-            # обновить в БД сведения о заданном клиенте
-            cur.execute("""
-                    UPDATE client
-                    SET
-                        first_name = %(first_name)s,
-                        last_name = %(last_name)s,
-                        email = %(email)s
-                    WHERE client_id = %(client_id)s;
-                """,
-                {
-                    'client_id': client_id,
-                    'first_name': new_first_name,
-                    'last_name': new_last_name,
-                    'email': new_email
-                }
-            )
-            self.conn.commit()
+    def update_client(self, client_id, new_first_name, new_last_name, new_email, cur=None):
+        try:
+            with self._operation(cur, savepoint=True) as cur:
+                # обновить в БД сведения о заданном клиенте
+                self._exec(cur, """
+                        UPDATE client
+                        SET
+                            first_name = %s,
+                            last_name = %s,
+                            email = %s
+                        WHERE client_id = %s;
+                    """,
+                    (new_first_name, new_last_name, new_email, client_id)
+                )
+        except psycopg2.errors.CheckViolation:
+            print('Указан некорретный email. Сведения о клиенте не изменены.')
+        except psycopg2.errors.UniqueViolation:
+            print('Клиент с указанным email уже существует. Сведения о клиенте не изменены.')
     
 
     # Функция, позволяющая удалить телефон для существующего клиента
-    def del_client_phone(self, phone_id):
-        with self.conn.cursor() as cur:
+    def del_client_phone(self, phone_id, cur=None):
+        with self._operation(cur) as cur:
             # удалить телефон клиента по ID телефона
-            cur.execute("""
+            self._exec(cur, """
                     DELETE FROM client_phone
                     WHERE client_phone_id = %s;
                 """,
                 (phone_id,)
             )
-            self.conn.commit()
     
 
     # Функция, позволяющая удалить существующего клиента
-    def del_client(self, client_id):
-        with self.conn.cursor() as cur:
-            # удалить все телефоны клиента по ID клиента
-            cur.execute("""
-                    DELETE FROM client_phone
-                    WHERE client_id = %s;
-                """,
-                (client_id,)
-            )
-            # удалить сведения о клиенте
-            cur.execute("""
+    def del_client(self, client_id, cur=None):
+        with self._operation(cur) as cur:
+            # удалить сведения о клиенте (его телефоны удаляются каскадно)
+            self._exec(cur, """
                     DELETE FROM client
                     WHERE client_id = %s;
                 """,
                 (client_id,)
             )
-            self.conn.commit()
     
 
     # Функция, позволяющая найти клиента по его данным: имени, фамилии, email или телефону
-    def find_client(self, field_name:str, field_value):
-        try:
-            db_filed_name = ClientDatabase.fields_to_search[field_name.lower()]
-        except KeyError:            
+    def find_client(self, field_name:str, field_value, cur=None):
+        find_sql = _FIND_SQL.get(field_name.lower())
+        if find_sql is None:
             print('Поиск возможен по одному из следующих полей: имя, фамилия, email, телефон. Пожалуйста, укажите корректное поле для поиска.')
             return
 
-        with self.conn.cursor() as cur:
-            cur.execute(
-                sql.SQL("""
-                    SELECT DISTINCT c.client_id, c.first_name, c.last_name, c.email
-                    FROM client c LEFT JOIN client_phone cp ON c.client_id = cp.client_id 
-                    WHERE {} = %s;
-                """).format(sql.Identifier(db_filed_name)),
-                (field_value,)
-            )
+        with self._operation(cur) as cur:
+            self._exec(cur, find_sql, (field_value,))
             return cur.fetchall()
     
 
     # Вывод сведений о всех клиентах и их телефонах
-    def print_all_clients(self):
-        with self.conn.cursor() as cur:
-            cur.execute("""
-                SELECT c.client_id, c.first_name, c.last_name, c.email, string_agg(cp.phone, ', ') phones
-                FROM client c LEFT JOIN client_phone cp ON c.client_id = cp.client_id
-                GROUP BY c.client_id, c.first_name, c.last_name, c.email;
-            """)
-            for client in cur:
-                print(client)
+    def print_all_clients(self, cur=None):
+        with self._operation(cur) as cur:
+            # именованный (серверный) курсор получает строки порциями по itersize, а не все сразу
+            with cur.connection.cursor(name='all_clients_cur') as all_clients_cur:
+                all_clients_cur.itersize = 1000
+                all_clients_cur.execute("""
+                    SELECT c.client_id, c.first_name, c.last_name, c.email, string_agg(cp.phone, ', ') phones
+                    FROM client c LEFT JOIN client_phone cp ON c.client_id = cp.client_id
+                    GROUP BY c.client_id, c.first_name, c.last_name, c.email;
+                """)
+                for client in all_clients_cur:
+                    print(client)
+
+
+# поиск клиента по телефону (достаточно найти хотя бы один подходящий телефон клиента)
+_FIND_BY_PHONE_SQL = """
+    SELECT c.client_id, c.first_name, c.last_name, c.email
+    FROM client c
+    WHERE EXISTS (
+        SELECT 1 FROM client_phone cp
+        WHERE cp.client_id = c.client_id AND cp.phone = %s
+    );
+"""
+
+# поиск клиента по одному из полей таблицы client (имя поля в SQL нельзя передать параметром;
+# подставляются только имена полей из ClientDatabase.fields_to_search)
+_FIND_BY_CLIENT_FIELD_SQL = """
+    SELECT client_id, first_name, last_name, email
+    FROM client
+    WHERE "{}" = %s;
+"""
+
+# тексты запросов для поиска клиента по каждому из полей, составленные один раз при загрузке модуля
+# (ключи приведены к нижнему регистру, чтобы поиск поля сводился к одному обращению к словарю)
+_FIND_SQL = {
+    field_name.lower(): (
+        _FIND_BY_PHONE_SQL if db_field_name == 'phone'
+        else _FIND_BY_CLIENT_FIELD_SQL.format(db_field_name)
+    )
+    for field_name, db_field_name in ClientDatabase.fields_to_search.items()
+}
 
 
 if __name__ == '__main__':
-    client_db = ClientDatabase('<database>', '<username>', '<user password>', '<host>')
+    with ClientDatabase('<database>', '<username>', '<user password>', '<host>') as client_db:
     
-    client_db.create_db_schema()
+        client_db.create_db_schema()
     
-    # демонстрация работы функции, позволяющей добавить нового клиента
-    client1_id = client_db.add_client('Иван', 'Иванов')
-    client_db.add_client('Василий', 'Петров', 'petrov@mail.server.ru')
-    client_db.add_client('Василий', 'Сидоров', 'v.sidorov@mail.com', ['+1-111-111-1111', '(495)000-00-00', '+0(000) 000 00 00'])
-    print('Сведения о клиентах после добавления 3-х клиентов:')
-    client_db.print_all_clients()
-    print()
-
-    # демонстрация работы функции, позволяющей добавить телефон для существующего клиента
-    client_db.add_client_phone(client1_id, '1234567890')
-    print('Сведения о клиентах после добавления телефона 1-ому клиенту:')
-    client_db.print_all_clients()
-    print()
-
-    # демонстрация работы функции, позволяющей изменить данные о клиенте
-    client_db.update_client(client1_id, 'Иван Иванович', 'Иванов', 'ivan.ii@mail.com')
-    print('Сведения о клиентах после изменения данных о 1-м клиенте:')
-    client_db.print_all_clients()
-    print()
-
-    # демонстрация работы функции, позволяющей удалить телефон для существующего клиента
-    client_db.del_client_phone(1)
-    print('Сведения о клиентах после удаления телефона существующего клиента:')
-    client_db.print_all_clients()
-    print()
-
-    # демонстрация работы функции, позволяющей удалить существующего клиента
-    client_db.del_client(client1_id)
-    print('Сведения о клиентах после удаления 1-ого клиента:')
-    client_db.print_all_clients()
-    print()
-
-    # демонстрация работы функции, позволяющей найти клиента по его данным: имени, фамилии, email или телефону
-    search_result = client_db.find_client('имя', 'Василий')
-    print(f'Результаты поиска клиента по имени (Василий):\n{search_result}\n')
-    search_result = client_db.find_client('Фамилия', 'Петров')
-    print(f'Результаты поиска клиента по фамилии (Петров):\n{search_result}\n')
-    search_result = client_db.find_client('email', 'petrov@mail.server.ru')
-    print(f'Результаты поиска клиента по email (petrov@mail.server.ru):\n{search_result}\n')
-    search_result = client_db.find_client('телефон', '(495)000-00-00')
-    print(f'Результаты поиска клиента по телефону ((495)000-00-00):\n{search_result}\n')
+        # демонстрация работы функции, позволяющей добавить нового клиента
+        client1_id = client_db.add_client('Иван', 'Иванов')
+        client_db.add_client('Василий', 'Петров', 'petrov@mail.server.ru')
+        client_db.add_client('Василий', 'Сидоров', 'v.sidorov@mail.com', ['+1-111-111-1111', '(495)000-00-00', '+0(000) 000 00 00'])
+        print('Сведения о клиентах после добавления 3-х клиентов:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация работы функции, позволяющей добавить телефон для существующего клиента
+        client_db.add_client_phone(client1_id, '1234567890')
+        print('Сведения о клиентах после добавления телефона 1-ому клиенту:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация работы функции, позволяющей изменить данные о клиенте
+        client_db.update_client(client1_id, 'Иван Иванович', 'Иванов', 'ivan.ii@mail.com')
+        print('Сведения о клиентах после изменения данных о 1-м клиенте:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация работы функции, позволяющей удалить телефон для существующего клиента
+        client_db.del_client_phone(1)
+        print('Сведения о клиентах после удаления телефона существующего клиента:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация работы функции, позволяющей удалить существующего клиента
+        client_db.del_client(client1_id)
+        print('Сведения о клиентах после удаления 1-ого клиента:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация работы функции, позволяющей найти клиента по его данным: имени, фамилии, email или телефону
+        search_result = client_db.find_client('имя', 'Василий')
+        print(f'Результаты поиска клиента по имени (Василий):\n{search_result}\n')
+        search_result = client_db.find_client('Фамилия', 'Петров')
+        print(f'Результаты поиска клиента по фамилии (Петров):\n{search_result}\n')
+        search_result = client_db.find_client('email', 'petrov@mail.server.ru')
+        print(f'Результаты поиска клиента по email (petrov@mail.server.ru):\n{search_result}\n')
+        search_result = client_db.find_client('телефон', '(495)000-00-00')
+        print(f'Результаты поиска клиента по телефону ((495)000-00-00):\n{search_result}\n')
+
+        # демонстрация работы функции, позволяющей добавить сразу нескольких клиентов
+        client_db.add_clients(
+            [('Пётр', 'Смирнов', 'smirnov@mail.com'), ('Анна', 'Кузнецова', None)],
+            {0: ['+7(900)111-22-33'], 1: ['8-800-000-00-00', '(812)123-45-67']}
+        )
+        print('Сведения о клиентах после добавления 2-х клиентов одной операцией:')
+        client_db.print_all_clients()
+        print()
+
+        # демонстрация выполнения нескольких операций в одной транзакции
+        with client_db.transaction():
+            client4_id = client_db.add_client('Ольга', 'Новикова')
+            client_db.add_client_phone(client4_id, '+7(495)765-43-21')
+            client_db.update_client(client4_id, 'Ольга', 'Новикова', 'o.novikova@mail.com')
+        print('Сведения о клиентах после добавления и изменения клиента в одной транзакции:')
+        client_db.print_all_clients()
+        print()
+
+    ClientDatabase.close_pool()